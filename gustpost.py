@@ -14,7 +14,9 @@ from typing import List, Dict, Optional
 import plotly.express as px
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
-from collections import Counter
+from collections import Counter, OrderedDict
+import hashlib
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -87,6 +89,8 @@ class UltimateGuestPostSite:
     do_follow_links: bool = False
     submission_requirements: List[str] = None
     preferred_topics: List[str] = None
+    content_fingerprint: str = ""
+    duplicate_urls: List[str] = None
     
     def __post_init__(self):
         if self.emails is None:
@@ -101,6 +105,8 @@ class UltimateGuestPostSite:
             self.submission_requirements = []
         if self.preferred_topics is None:
             self.preferred_topics = []
+        if self.duplicate_urls is None:
+            self.duplicate_urls = []
 
 class Config:
     USER_AGENTS = [
@@ -185,6 +191,70 @@ class Config:
         '"{}" "contributor page"', '"{}" "author page"', '"{}" "submit content page"',
         '"{}" "write page"', '"{}" "contribution page"', '"{}" "guest page"',
     ]
+    
+    # Near-duplicate detection (SimHash)
+    SIMHASH_MAX_DISTANCE = 6  # Max differing bits to treat two pages as duplicates
+    FINGERPRINT_INDEX_SIZE = 5000  # Oldest fingerprints are evicted beyond this
+
+class ContentFingerprintIndex:
+    """Thread-safe SimHash index for spotting mirrored or templated pages"""
+    
+    BITS = 64
+    
+    def __init__(self, max_distance: int = 6, max_entries: int = 5000):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        # Pigeonhole: with max_distance + 1 bands, a near-duplicate matches at least one band exactly
+        self.bands = max_distance + 1
+        self.band_bits = self.BITS // self.bands
+        self.fingerprints: "OrderedDict[str, int]" = OrderedDict()
+        self.buckets: List[Dict[int, List[str]]] = [{} for _ in range(self.bands)]
+        self.clusters: Dict[str, List[str]] = {}
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def simhash(text: str) -> int:
+        """64-bit SimHash over word 3-shingles"""
+        words = re.findall(r'\w+', text.lower())
+        shingles = [' '.join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))]
+        weights = [0] * ContentFingerprintIndex.BITS
+        for shingle, count in Counter(shingles).items():
+            h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+            for bit in range(ContentFingerprintIndex.BITS):
+                weights[bit] += count if h >> bit & 1 else -count
+        return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+    
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        mask = (1 << self.band_bits) - 1
+        return [fingerprint >> (i * self.band_bits) & mask for i in range(self.bands)]
+    
+    def _evict_oldest(self):
+        url, fingerprint = self.fingerprints.popitem(last=False)
+        for bucket, key in zip(self.buckets, self._band_keys(fingerprint)):
+            members = bucket.get(key, [])
+            if url in members:
+                members.remove(url)
+            if not members:
+                bucket.pop(key, None)
+    
+    def find_or_add(self, url: str, fingerprint: int) -> Optional[str]:
+        """Return the representative URL of a near-duplicate, or index this page and return None"""
+        with self.lock:
+            for bucket, key in zip(self.buckets, self._band_keys(fingerprint)):
+                for candidate in bucket.get(key, []):
+                    if bin(fingerprint ^ self.fingerprints[candidate]).count('1') <= self.max_distance:
+                        self.clusters.setdefault(candidate, []).append(url)
+                        return candidate
+            
+            if len(self.fingerprints) >= self.max_entries:
+                self._evict_oldest()
+            self.fingerprints[url] = fingerprint
+            for bucket, key in zip(self.buckets, self._band_keys(fingerprint)):
+                bucket.setdefault(key, []).append(url)
+            return None
+    
+    def duplicate_count(self) -> int:
+        return sum(len(urls) for urls in self.clusters.values())
 
 class GuestPostFinder:
     def __init__(self):
@@ -196,11 +266,16 @@ class GuestPostFinder:
         })
         self.results: List[UltimateGuestPostSite] = []
         self.found_urls = set()
+        self.fingerprint_index = self._new_fingerprint_index()
         
         self.google_api_key = st.session_state.get('google_api_key', '')
         self.google_cse_id = st.session_state.get('google_cse_id', '')
         self.bing_api_key = st.session_state.get('bing_api_key', '')
 
+    def _new_fingerprint_index(self) -> ContentFingerprintIndex:
+        return ContentFingerprintIndex(self.config.SIMHASH_MAX_DISTANCE,
+                                       self.config.FINGERPRINT_INDEX_SIZE)
+
     def google_search(self, query: str, num_results: int = 100) -> List[str]:
         """Google Custom Search - Multiple pages"""
         if not self.google_api_key or not self.google_cse_id:
@@ -417,6 +492,11 @@ class GuestPostFinder:
             if keyword_count < 2:
                 return None
             
+            # Skip mirrors and templated copies of a page we've already analyzed
+            fingerprint = ContentFingerprintIndex.simhash(text)
+            if self.fingerprint_index.find_or_add(url, fingerprint):
+                return None
+            
             # Extract info
             title = soup.title.string if soup.title else urlparse(url).netloc
             title = title.strip()[:200] if title else urlparse(url).netloc
@@ -451,7 +531,8 @@ class GuestPostFinder:
                 confidence_level=level,
                 overall_score=0.0,
                 success_probability=confidence / 100.0,
-                preferred_topics=[niche]
+                preferred_topics=[niche],
+                content_fingerprint=f"{fingerprint:016x}"
             )
             
             return site
@@ -471,6 +552,7 @@ class GuestPostFinder:
             return
         
         st.success(f"✅ Found {len(urls)} unique URLs. Analyzing sites...")
+        self.fingerprint_index = self._new_fingerprint_index()
         
         # Analyze sites
         progress_bar = st.progress(0)
@@ -497,8 +579,13 @@ class GuestPostFinder:
         progress_bar.empty()
         status_text.empty()
         
+        duplicates = self.fingerprint_index.duplicate_count()
+        if duplicates:
+            st.info(f"🧬 Skipped {duplicates} near-duplicate pages (mirrors / templated copies)")
+        
         # Score and sort
         for site in results:
+            site.duplicate_urls = self.fingerprint_index.clusters.get(site.url, [])
             site.overall_score = (site.estimated_da * 0.3 + site.content_quality_score * 0.3 + 
                                 site.confidence_score * 0.4)
             site.priority_level = 'HIGH' if site.overall_score >= 70 else 'MEDIUM' if site.overall_score >= 50 else 'LOW'
@@ -518,7 +605,8 @@ class GuestPostFinder:
                 'Domain': r.domain, 'URL': r.url, 'Title': r.title,
                 'Emails': ', '.join(r.emails), 'DA': r.estimated_da,
                 'Quality': r.content_quality_score, 'Score': f"{r.overall_score:.1f}",
-                'Level': r.confidence_level, 'Priority': r.priority_level
+                'Level': r.confidence_level, 'Priority': r.priority_level,
+                'Duplicates': ', '.join(r.duplicate_urls)
             })
         return pd.DataFrame(data).to_csv(index=False)
 
@@ -613,6 +701,8 @@ class GuestPostFinder:
                             st.write(f"**Title:** {site.title}")
                             if site.emails:
                                 st.write(f"**📧 Emails:** {', '.join(site.emails)}")
+                            if site.duplicate_urls:
+                                st.write(f"**🧬 Duplicates ({len(site.duplicate_urls)}):** {', '.join(site.duplicate_urls[:5])}")
                         with col2:
                             st.metric("DA", site.estimated_da)
                             st.metric("Quality", site.content_quality_score)
@@ -622,7 +712,8 @@ class GuestPostFinder:
                 df = pd.DataFrame([{
                     '#': i+1, 'Domain': r.domain, 'DA': r.estimated_da,
                     'Quality': r.content_quality_score, 'Score': f"{r.overall_score:.0f}",
-                    'Level': r.confidence_level, 'Emails': len(r.emails)
+                    'Level': r.confidence_level, 'Emails': len(r.emails),
+                    'Duplicates': len(r.duplicate_urls)
                 } for i, r in enumerate(results)])
                 st.dataframe(df, use_container_width=True, height=600)
             